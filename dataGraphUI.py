@@ -1,10 +1,559 @@
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
+from multiprocessing import Event, Process, shared_memory
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from dateutil.tz import tzlocal
 import pyqtgraph as pg
 import pandas as pd
+import numpy as np
+import threading
+import tempfile
 import random
+import shutil
+import time
 import sys
+import io
+import os
+
+
+# Order of the values stored in each row of the shared memory ring buffer
+SHARED_COLUMNS = ["Elapsed Seconds", "Temperature", "pH", "Flow Rate", "Acquired At"]
+
+# Seconds between samples, used by both the timer signal and the acquisition process
+ACQUISITION_INTERVAL = 2
+
+
+# Formats elapsed seconds as hh:mm:ss, hours keep counting past a day instead of wrapping around
+def formatElapsed(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+# Fonts used across the UI, keyed by role: (family, point size, bold, underline)
+# A family of None keeps the system default font
+FONT_ROLES = {
+    "title": ("Rockwell Extra Bold", 18, True, True),
+    "timerTitle": ("Rockwell Extra Bold", 22, True, True),
+    "tabs": ("Rockwell", 12, False, False),
+    "inputLabel": ("Rockwell", 14, False, False),
+    "trackerLabel": ("Montserrat Medium", 16, False, True),
+    "status": ("Segoe UI Black", 14, True, False),
+    "clock": (None, 28, False, False),
+}
+
+# Object names of the tracker head labels for each variable, used to color them from one style sheet
+TRACKER_LABELS = {"Temperature": "tempLabelTrack", "pH": "phTrackLabel", "Flow Rate": "flowRTrackLabel"}
+
+# Colors for each theme the user can switch between
+# Channel colors are used for the graph pens, tracker colors for the background of the tracker labels
+THEMES = {
+    "Default": {
+        "channelColors": {"Temperature": (175, 60, 60), "pH": (48, 172, 85), "Flow Rate": (76, 87, 186),
+                          "Batched": (200, 200, 200), "Band": (255, 200, 0, 50), "Warning": (255, 80, 0)},
+        "trackerColors": {"Temperature": "red", "pH": "lightgreen", "Flow Rate": "blue"},
+        "graphBackground": "k",
+        "graphForeground": "d",
+    },
+    "Light": {
+        "channelColors": {"Temperature": (190, 45, 45), "pH": (30, 140, 60), "Flow Rate": (50, 60, 170),
+                          "Batched": (90, 90, 90), "Band": (230, 160, 0, 60), "Warning": (210, 40, 0)},
+        "trackerColors": {"Temperature": "#f4a6a6", "pH": "#b6e8c2", "Flow Rate": "#a9b4ee"},
+        "graphBackground": "w",
+        "graphForeground": "k",
+    },
+}
+
+
+# Builds pens, brushes, fonts and style sheets once and shares them with every widget and graph
+# Widgets connect to themeChanged and restyle themselves in place when the theme is switched
+class StyleCache(QObject):
+    themeChanged = pyqtSignal()
+
+    def __init__(self, themeName="Default"):
+        super().__init__()
+        self.fonts = {}
+        self.pens = {}
+        self.brushes = {}
+        self.styleSheets = {}
+        self.themeName = themeName
+        self.theme = THEMES[themeName]
+
+    def setTheme(self, themeName):
+        # Colors depend on the theme, so pens, brushes and style sheets are rebuilt on their next request
+        self.themeName = themeName
+        self.theme = THEMES[themeName]
+        self.pens.clear()
+        self.brushes.clear()
+        self.styleSheets.clear()
+        self.themeChanged.emit()
+
+    def font(self, role):
+        if role not in self.fonts:
+            family, size, bold, underline = FONT_ROLES[role]
+            font = QFont()
+            if family:
+                font.setFamily(family)
+            font.setPointSize(size)
+            font.setBold(bold)
+            font.setUnderline(underline)
+            self.fonts[role] = font
+        return self.fonts[role]
+
+    def color(self, name, index=0, count=1):
+        # Variables without a set color get one spread evenly around the color wheel
+        if name in self.theme["channelColors"]:
+            return self.theme["channelColors"][name]
+        return pg.intColor(index, hues=count)
+
+    def pen(self, name, width=3, index=0, count=1):
+        key = (name, width, index, count)
+        if key not in self.pens:
+            self.pens[key] = pg.mkPen(color=self.color(name, index, count), width=width)
+        return self.pens[key]
+
+    def brush(self, name, index=0, count=1):
+        key = (name, index, count)
+        if key not in self.brushes:
+            self.brushes[key] = pg.mkBrush(self.color(name, index, count))
+        return self.brushes[key]
+
+    def trackerStyleSheet(self):
+        if "tracker" not in self.styleSheets:
+            self.styleSheets["tracker"] = "\n".join(
+                f"QLabel#{label} {{ background-color: {self.theme['trackerColors'][name]} }}"
+                for name, label in TRACKER_LABELS.items())
+        return self.styleSheets["tracker"]
+
+    def styleGraph(self, plotWidget):
+        # Applies the theme background and axis colors to a graph
+        plotWidget.setBackground(self.theme["graphBackground"])
+        for axis in ("left", "bottom"):
+            plotWidget.getAxis(axis).setPen(self.theme["graphForeground"])
+            plotWidget.getAxis(axis).setTextPen(self.theme["graphForeground"])
+
+
+# Shared by every widget so each style object is only built once
+styleCache = StyleCache()
+
+
+# Keeps a rolling window of timing samples (in seconds) and summarizes them for the user
+class TimingStats:
+    def __init__(self, size=500):
+        self.samples = deque(maxlen=size)
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+
+    def clear(self):
+        self.samples.clear()
+
+    def summary(self):
+        # Returns mean, standard deviation and max of the window in milliseconds
+        if not self.samples:
+            return {"mean": 0.0, "std": 0.0, "max": 0.0}
+        values = np.asarray(self.samples) * 1000
+        return {"mean": float(values.mean()), "std": float(values.std()), "max": float(values.max())}
+
+
+# Ring buffer that lives in shared memory so a separate acquisition process can hand samples to the GUI
+# without pickling. The header holds the sequence counter (total rows ever written) and the capacity,
+# followed by the rows of SHARED_COLUMNS values
+class SharedDataBuffer:
+    HEADER_SIZE = 16
+
+    def __init__(self, name=None, capacity=4096, create=False):
+        self.owner = create
+        width = len(SHARED_COLUMNS)
+
+        if create:
+            size = self.HEADER_SIZE + capacity * width * 8
+            self.memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+
+        # Header values are mapped directly onto the shared block
+        self.header = np.ndarray((2,), dtype=np.int64, buffer=self.memory.buf)
+        if create:
+            self.header[:] = (0, capacity)
+        self.capacity = int(self.header[1])
+        self.rows = np.ndarray((self.capacity, width), dtype=np.float64, buffer=self.memory.buf,
+                               offset=self.HEADER_SIZE)
+
+        # Sequence number of the next row this side has not read yet
+        self.readSequence = 0
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def write(self, values):
+        # Writes the row first and only then publishes it by bumping the sequence counter
+        sequence = int(self.header[0])
+        self.rows[sequence % self.capacity] = values
+        self.header[0] = sequence + 1
+
+    def readNew(self):
+        # Returns a copy of the rows written since the last read, taken straight out of shared memory
+        end = int(self.header[0])
+        start = max(self.readSequence, end - self.capacity)
+        if start >= end:
+            return self.rows[:0].copy()
+
+        first = start % self.capacity
+        count = end - start
+        if first + count <= self.capacity:
+            newRows = np.array(self.rows[first:first + count])
+        else:
+            newRows = np.concatenate((self.rows[first:], self.rows[:count - (self.capacity - first)]))
+
+        # The copy is done, so if the writer lapped us while copying, the oldest rows may be half overwritten
+        # and are dropped. The writer stores a row before bumping the counter, so the slot after the counter
+        # may be in the middle of being written and counts as overwritten too
+        overwritten = int(self.header[0]) + 1 - self.capacity - start
+        if overwritten > 0:
+            newRows = newRows[overwritten:]
+
+        self.readSequence = end
+        return newRows
+
+    def skipToLatest(self):
+        # Marks everything written so far as read
+        self.readSequence = int(self.header[0])
+
+    def close(self):
+        # Numpy views have to be released before the shared block can be closed
+        del self.header, self.rows
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+# Runs in its own process so that data acquisition is not held up by the GUI (and its GIL)
+def acquisitionProcess(bufferName, stopEvent, interval=ACQUISITION_INTERVAL):
+    buffer = SharedDataBuffer(bufferName)
+    startTime = time.monotonic()
+    sampleCount = 0
+
+    while True:
+        # Sleeps until the next deadline instead of a fixed interval so the error does not build up
+        sampleCount += 1
+        deadline = startTime + sampleCount * interval
+        if stopEvent.wait(max(0.0, deadline - time.monotonic())):
+            break
+
+        # Generates random data to fill graph plot points
+        acquiredAt = time.monotonic()
+        buffer.write([sampleCount * interval, round(random.uniform(20, 50), 2), round(random.uniform(6, 8), 2),
+                      round(random.uniform(5, 25), 2), acquiredAt])
+
+    buffer.close()
+
+
+# Follows a growing CSV log written by an instrument and parses only the bytes appended since the last read
+# The first line of the file is its header, the time column is the first column unless another one is given
+class FileTailer:
+    def __init__(self, path, timeColumn=None, chunkSize=16 * 1024 * 1024):
+        self.path = path
+        self.timeColumn = timeColumn
+        self.chunkSize = chunkSize
+
+        # Channels are named after the file so columns from different instruments do not clash
+        self.name = os.path.splitext(os.path.basename(path))[0]
+
+        self.file = None
+        self.fileId = None
+        self.header = None
+
+        # Unfinished last line, kept until the instrument writes the rest of it
+        self.partial = b""
+
+        # Set when the last read stopped at chunkSize, meaning there is more to read right away
+        self.behind = False
+
+        # A log that already exists when it is added is only followed from its end, its backlog is skipped
+        # Set back to False if the file only shows up later, since then everything in it is new
+        self.skipBacklog = True
+
+        # Set when the read position was moved into the middle of a line, which is dropped up to its end
+        self.discardLine = False
+
+    def open(self, fromStart=True):
+        self.file = open(self.path, "rb")
+        stat = os.fstat(self.file.fileno())
+        self.fileId = (stat.st_dev, stat.st_ino)
+        self.header = None
+        self.partial = b""
+        self.discardLine = False
+        if not fromStart:
+            self.seekToEnd()
+
+    def seekToEnd(self, tailSize=64 * 1024):
+        # Reads the header, then moves to the start of the file's last unfinished line so only new rows are read
+        headerLine = self.file.readline()
+        if not headerLine.endswith(b"\n"):
+            # The header is not finished yet, so there is no backlog to skip
+            self.file.seek(0)
+            return
+        self.header = self.parseHeader(headerLine)
+
+        headerEnd = self.file.tell()
+        end = self.file.seek(0, os.SEEK_END)
+        tailStart = max(headerEnd, end - tailSize)
+        self.file.seek(tailStart)
+        lastNewline = self.file.read().rfind(b"\n")
+        if lastNewline >= 0:
+            self.file.seek(tailStart + lastNewline + 1)
+        else:
+            # No line ends near the end of the file, so the line being written is skipped instead
+            self.file.seek(end)
+            self.discardLine = end > headerEnd
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def readNew(self):
+        # Returns a data frame of the complete rows appended since the last call, or None if there are none
+        if self.file is None:
+            if not os.path.exists(self.path):
+                self.skipBacklog = False
+                return None
+            self.open(fromStart=not self.skipBacklog)
+
+        frames = []
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            # The log was moved away and the new one is not created yet, keeps reading the old one
+            stat = None
+
+        if stat is not None and (stat.st_dev, stat.st_ino) != self.fileId:
+            # Rotated by renaming, the rest of the old file is read before switching over to the new one
+            frames.append(self.parse(self.file.read()))
+            self.close()
+            self.open()
+        elif stat is not None and stat.st_size < self.file.tell():
+            # Truncated in place, starts again from the top
+            self.file.seek(0)
+            self.header = None
+            self.partial = b""
+
+        data = self.file.read(self.chunkSize)
+        self.behind = len(data) == self.chunkSize
+        frames.append(self.parse(data))
+
+        frames = [frame for frame in frames if frame is not None]
+        return pd.concat(frames, ignore_index=True) if frames else None
+
+    def parse(self, data):
+        # Only complete lines are parsed, the unfinished last line waits for the next read
+        data = self.partial + data
+        end = data.rfind(b"\n")
+        if end < 0:
+            self.partial = data
+            return None
+        data, self.partial = data[:end + 1], data[end + 1:]
+
+        if self.discardLine:
+            data = data.partition(b"\n")[2]
+            self.discardLine = False
+        if self.header is None:
+            headerLine, _, data = data.partition(b"\n")
+            self.header = self.parseHeader(headerLine)
+        if not data.strip():
+            return None
+
+        # The whole block is handed to the pandas C parser at once, malformed lines are skipped
+        frame = pd.read_csv(io.BytesIO(data), header=None, names=self.header, on_bad_lines="skip",
+                            skipinitialspace=True)
+        timeColumn = self.timeColumn or self.header[0]
+
+        result = pd.DataFrame({"Epoch": toEpochSeconds(frame[timeColumn])})
+        for column in self.header:
+            if column != timeColumn:
+                result[f"{self.name}: {column}"] = pd.to_numeric(frame[column], errors="coerce")
+        return result.dropna(subset=["Epoch"])
+
+    def parseHeader(self, headerLine):
+        return [column.strip() for column in headerLine.decode(errors="replace").split(",")]
+
+
+# Converts a column of timestamps into Unix epoch seconds
+# Numbers are taken as epoch seconds already, text is parsed as a date and time in the local time zone
+def toEpochSeconds(values):
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(np.float64)
+
+    stamps = pd.to_datetime(values, errors="coerce")
+    if stamps.dt.tz is None:
+        stamps = stamps.dt.tz_localize(tzlocal(), ambiguous="NaT", nonexistent="NaT")
+    return (stamps - pd.Timestamp(0, tz="UTC")).dt.total_seconds()
+
+
+# Sensor rows older than this many seconds are only kept as the last value of each channel
+# Leaves room for samples that are merged a little after they were taken, like on the shared memory path
+SENSOR_MERGE_SLACK = 5 * ACQUISITION_INTERVAL
+
+# Most sensor rows newer than that kept waiting for a merge, the oldest are dropped beyond it
+MAX_PENDING_SENSOR_ROWS = 100_000
+
+
+# Keeps waiting sensor rows from growing without limit while no samples are being taken
+# The merge only ever needs the latest value before a sample, so rows up to the cutoff are collapsed into
+# one row holding the last value of each channel
+def compactSensorRows(frame, cutoff, maxRows=MAX_PENDING_SENSOR_ROWS):
+    older = frame["Epoch"] <= cutoff
+    if older.sum() > 1:
+        last = frame[older].sort_values("Epoch", kind="stable").ffill().iloc[[-1]]
+        frame = pd.concat([last, frame[~older]], ignore_index=True)
+    if len(frame) > maxRows:
+        frame = frame.sort_values("Epoch", kind="stable").iloc[-maxRows:]
+    return frame
+
+
+# Tails sensor log files on a background thread so reading and parsing never blocks the GUI
+# Parsed rows wait in pending until the DataHandler picks them up on a timer tick, and are compacted
+# as they come in so they stay bounded while the timer is stopped
+class SensorFileIngest(QObject):
+    # Signal that sends a failure reading one of the files to the GUI
+    errorSignal = pyqtSignal(str)
+
+    def __init__(self, pollInterval=0.5):
+        super().__init__()
+        self.pollInterval = pollInterval
+        self.tailers = []
+        # Last error of each file, so a file that keeps failing is only reported once
+        self.errors = {}
+        self.pending = pd.DataFrame({"Epoch": []})
+        self.lock = threading.Lock()
+        self.stopEvent = threading.Event()
+        self.thread = None
+
+    def addFile(self, path, timeColumn=None):
+        self.tailers.append(FileTailer(path, timeColumn))
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while True:
+            behind = False
+            for tailer in list(self.tailers):
+                try:
+                    frame = tailer.readNew()
+                except Exception as e:
+                    # A bad file should not stop the other files from being read
+                    message = f"Failed to read {tailer.path}: {e}"
+                    if self.errors.get(tailer.path) != message:
+                        self.errors[tailer.path] = message
+                        self.errorSignal.emit(message)
+                    continue
+                self.errors.pop(tailer.path, None)
+                if frame is not None and len(frame):
+                    with self.lock:
+                        self.pending = compactSensorRows(pd.concat([self.pending, frame], ignore_index=True),
+                                                         time.time() - SENSOR_MERGE_SLACK)
+                behind = behind or tailer.behind
+
+            # Only waits when every file is caught up
+            if self.stopEvent.wait(0 if behind else self.pollInterval):
+                break
+
+        for tailer in self.tailers:
+            tailer.close()
+
+    def drain(self):
+        # Takes everything parsed since the last call
+        with self.lock:
+            frames, self.pending = [self.pending], pd.DataFrame({"Epoch": []})
+        return [frame for frame in frames if len(frame)]
+
+    def stop(self):
+        self.stopEvent.set()
+        if self.thread is not None:
+            self.thread.join(timeout=self.pollInterval * 4)
+            self.thread = None
+
+
+# Margin of deviation from target value allowed for each variable
+# Temporarily set for TESTING Purposes
+STATUS_MARGINS = {"Temperature": 1, "pH": 0.05, "Flow Rate": 1}
+
+
+# Status of data compared to its target, works on single values and whole arrays alike
+# 0 when the data matches the target, 1 when it is within the margin, 2 when it is outside of it
+def classifyStatus(values, target, margin):
+    values = np.asarray(values)
+    inBand = ((target - margin) < values) & (values < (target + margin))
+    return np.where(values == target, 0, np.where(inBand, 1, 2))
+
+
+# Time each sample's status holds for, which is until the next sample comes in
+# The last sample gets the typical sample interval and missing values count for nothing
+def sampleDurations(times, values):
+    times = np.asarray(times, dtype=np.float64)
+    if len(times) < 2:
+        return np.zeros(len(times))
+    steps = np.diff(times)
+    durations = np.append(steps, np.median(steps))
+    return np.where(np.isfinite(values), durations, 0.0)
+
+
+# Replays a recorded run through the status logic for every combination of target and margin
+# Samples are split into chunks that are worked through in parallel, numpy releases the GIL while doing the math
+def replaySweep(times, values, targets, margins, chunkElements=1_000_000):
+    values = np.asarray(values, dtype=np.float64)
+    durations = sampleDurations(times, values)
+    targets = np.asarray(targets, dtype=np.float64).reshape(-1, 1, 1)
+    margins = np.asarray(margins, dtype=np.float64).reshape(1, -1, 1)
+    gridSize = targets.size * margins.size
+    chunkSize = max(1, chunkElements // gridSize)
+
+    def replayChunk(start):
+        chunk = values[start:start + chunkSize]
+        weights = durations[start:start + chunkSize]
+        equal = chunk == targets
+        inBand = ((targets - margins) < chunk) & (chunk < (targets + margins))
+        good = equal.astype(np.float64) @ weights
+        off = (inBand & ~equal).astype(np.float64) @ weights
+        return np.broadcast_to(good, off.shape), off, (~inBand & ~equal & np.isfinite(chunk)).sum(axis=-1)
+
+    with ThreadPoolExecutor() as executor:
+        results = list(executor.map(replayChunk, range(0, len(values), chunkSize)))
+
+    shape = (targets.size, margins.size)
+    goodTime = sum((result[0] for result in results), np.zeros(shape))
+    offTime = sum((result[1] for result in results), np.zeros(shape))
+    warningCount = sum((result[2] for result in results), np.zeros(shape, dtype=np.int64))
+    warningTime = durations.sum() - goodTime - offTime
+
+    # One row per target and margin pair
+    targetGrid, marginGrid = np.meshgrid(targets.ravel(), margins.ravel(), indexing="ij")
+    total = durations.sum()
+    return pd.DataFrame({
+        "Target": targetGrid.ravel(),
+        "Margin": marginGrid.ravel(),
+        "Good (s)": goodTime.ravel(),
+        "Off (s)": offTime.ravel(),
+        "Warning (s)": warningTime.ravel(),
+        "Warning Samples": warningCount.ravel(),
+        "Out of Band (%)": (warningTime.ravel() / total * 100) if total else np.zeros(gridSize),
+    })
+
+
+# Reads a grid of values typed by the user, either "start:stop:step" (stop included) or a comma separated list
+def parseGrid(text):
+    text = text.strip()
+    if ":" in text:
+        start, stop, step = (float(part) for part in text.split(":"))
+        if step <= 0:
+            raise ValueError("Step has to be above 0")
+        return np.round(np.arange(start, stop + step / 2, step), 10)
+    return np.array([float(part) for part in text.split(",") if part.strip()])
 
 
 # Widget that sets up and controls the labels for Temp, pH, and Flow Rate
@@ -37,6 +586,10 @@ class TrackerWidget(QWidget):
         self.pHTrackerSetup()
         self.flowRateTrackerSetup()
 
+        # One style sheet on the frame colors every tracker label, swapped in place when the theme changes
+        self.applyTheme()
+        styleCache.themeChanged.connect(self.applyTheme)
+
         # Layout set up for child widget purposes
         layout = QVBoxLayout(self)
         layout.addWidget(self.trackerFrame)
@@ -53,23 +606,14 @@ class TrackerWidget(QWidget):
 
         # Initialize the head label and add to layout with proper formatting
         self.tempLabelTrack = QLabel(self.tempTrackerFrame)
-        font = QFont()
-        font.setFamily("Montserrat Medium")
-        font.setPointSize(16)
-        font.setUnderline(True)
-        self.tempLabelTrack.setFont(font)
+        self.tempLabelTrack.setFont(styleCache.font("trackerLabel"))
         self.tempLabelTrack.setObjectName("tempLabelTrack")
         self.tempLabelTrack.setText("Temperature: 0 °C")
-        self.tempLabelTrack.setStyleSheet("background-color: red")
         self.verticalLayout_4.addWidget(self.tempLabelTrack, 0, Qt.AlignHCenter)
 
         # Initialize the status label
         self.tempStatusLabel = QLabel(self.tempTrackerFrame)
-        font = QFont()
-        font.setFamily("Segoe UI Black")
-        font.setPointSize(14)
-        font.setBold(True)
-        self.tempStatusLabel.setFont(font)
+        self.tempStatusLabel.setFont(styleCache.font("status"))
         self.tempStatusLabel.setObjectName("tempStatusLabel")
         self.tempStatusLabel.setText(self.statusList[0])
         self.tempStatusLabel.setToolTip(self.statusPhrase[0])
@@ -87,23 +631,14 @@ class TrackerWidget(QWidget):
 
         # Initialize the head label and add to layout with proper formatting
         self.phTrackLabel = QLabel(self.pHTrackerFrame)
-        font = QFont()
-        font.setFamily("Montserrat Medium")
-        font.setPointSize(16)
-        font.setUnderline(True)
-        self.phTrackLabel.setFont(font)
+        self.phTrackLabel.setFont(styleCache.font("trackerLabel"))
         self.phTrackLabel.setObjectName("phTrackLabel")
         self.phTrackLabel.setText("pH: 0")
-        self.phTrackLabel.setStyleSheet("background-color: lightgreen")
         self.verticalLayout_5.addWidget(self.phTrackLabel, 0, Qt.AlignHCenter)
 
         # Initialize the status label
         self.pHStatusLabel = QLabel(self.pHTrackerFrame)
-        font = QFont()
-        font.setFamily("Segoe UI Black")
-        font.setPointSize(14)
-        font.setBold(True)
-        self.pHStatusLabel.setFont(font)
+        self.pHStatusLabel.setFont(styleCache.font("status"))
         self.pHStatusLabel.setObjectName("pHStatusLabel")
         self.pHStatusLabel.setText(self.statusList[0])
         self.pHStatusLabel.setToolTip(self.statusPhrase[0])
@@ -121,40 +656,28 @@ class TrackerWidget(QWidget):
 
         # Initialize the head label and add to layout with proper formatting
         self.flowRTrackLabel = QLabel(self.flowRateTrackFrame)
-        font = QFont()
-        font.setFamily("Montserrat Medium")
-        font.setPointSize(16)
-        font.setUnderline(True)
-        self.flowRTrackLabel.setFont(font)
+        self.flowRTrackLabel.setFont(styleCache.font("trackerLabel"))
         self.flowRTrackLabel.setObjectName("flowRTrackLabel")
         self.flowRTrackLabel.setText("Flow Rate: 0 mL/min")
-        self.flowRTrackLabel.setStyleSheet("background-color: blue")
         self.verticalLayout_6.addWidget(self.flowRTrackLabel, 0, Qt.AlignHCenter)
 
         # Initialize the status label
         self.flowRStatusLabel = QLabel(self.flowRateTrackFrame)
-        font = QFont()
-        font.setFamily("Segoe UI Black")
-        font.setPointSize(14)
-        font.setBold(True)
-        self.flowRStatusLabel.setFont(font)
+        self.flowRStatusLabel.setFont(styleCache.font("status"))
         self.flowRStatusLabel.setObjectName("flowRStatusLabel")
         self.flowRStatusLabel.setText(self.statusList[0])
         self.flowRStatusLabel.setToolTip(self.statusPhrase[0])
         self.verticalLayout_6.addWidget(self.flowRStatusLabel, 0, Qt.AlignHCenter)
         self.horizontalLayout_2.addWidget(self.flowRateTrackFrame)
 
+    def applyTheme(self):
+        self.trackerFrame.setStyleSheet(styleCache.trackerStyleSheet())
+
     # Slot function takes data from the signal and gives the whole class access to it
     def targetValuesSetup(self, targetValues):
         self.targetValues = targetValues
 
     def trackerManager(self, currentData):
-        # Margin of deviation from target value allowed
-        # Temporarily set for TESTING Purposes
-        TEMP_MARGIN = 1
-        PH_MARGIN = 0.05
-        FLOW_MARGIN = 1
-
         # Target Values set up
         if self.targetValues:
             tempTargetValue = float(self.targetValues["Temperature"])
@@ -166,38 +689,20 @@ class TrackerWidget(QWidget):
             pHTargetValue = 0
             flowRateTargetValue = 0
 
-        # Conditional managers for each variable, changing status according to data
-        if currentData["Temperature"] == tempTargetValue:
-            self.tempStatusLabel.setText(self.statusList[0])
-            self.tempStatusLabel.setToolTip(self.statusPhrase[0])
-        elif (tempTargetValue - TEMP_MARGIN) < currentData["Temperature"] < (tempTargetValue + TEMP_MARGIN):
-            self.tempStatusLabel.setText(self.statusList[1])
-            self.tempStatusLabel.setToolTip(self.statusPhrase[1])
-        else:
-            self.tempStatusLabel.setText(self.statusList[2])
-            self.tempStatusLabel.setToolTip(self.statusPhrase[2])
+        # Status managers for each variable, changing status according to data
+        status = int(classifyStatus(currentData["Temperature"], tempTargetValue, STATUS_MARGINS["Temperature"]))
+        self.tempStatusLabel.setText(self.statusList[status])
+        self.tempStatusLabel.setToolTip(self.statusPhrase[status])
 
         # pH
-        if currentData["pH"] == pHTargetValue:
-            self.pHStatusLabel.setText(self.statusList[0])
-            self.pHStatusLabel.setToolTip(self.statusPhrase[0])
-        elif (pHTargetValue - PH_MARGIN) < currentData["pH"] < (pHTargetValue + PH_MARGIN):
-            self.pHStatusLabel.setText(self.statusList[1])
-            self.pHStatusLabel.setToolTip(self.statusPhrase[1])
-        else:
-            self.pHStatusLabel.setText(self.statusList[2])
-            self.pHStatusLabel.setToolTip(self.statusPhrase[2])
+        status = int(classifyStatus(currentData["pH"], pHTargetValue, STATUS_MARGINS["pH"]))
+        self.pHStatusLabel.setText(self.statusList[status])
+        self.pHStatusLabel.setToolTip(self.statusPhrase[status])
 
         # Flow Rate
-        if currentData["Flow Rate"] == flowRateTargetValue:
-            self.flowRStatusLabel.setText(self.statusList[0])
-            self.flowRStatusLabel.setToolTip(self.statusPhrase[0])
-        elif (flowRateTargetValue - FLOW_MARGIN) < currentData["Flow Rate"] < (flowRateTargetValue + FLOW_MARGIN):
-            self.flowRStatusLabel.setText(self.statusList[1])
-            self.flowRStatusLabel.setToolTip(self.statusPhrase[1])
-        else:
-            self.flowRStatusLabel.setText(self.statusList[2])
-            self.flowRStatusLabel.setToolTip(self.statusPhrase[2])
+        status = int(classifyStatus(currentData["Flow Rate"], flowRateTargetValue, STATUS_MARGINS["Flow Rate"]))
+        self.flowRStatusLabel.setText(self.statusList[status])
+        self.flowRStatusLabel.setToolTip(self.statusPhrase[status])
 
         # Passing the current data to update the data displayed on the trackers
         self.updateTrackerData(currentData)
@@ -209,9 +714,163 @@ class TrackerWidget(QWidget):
         self.flowRTrackLabel.setText(f"Flow Rate: {currentData['Flow Rate']} mL/min")
 
 
+# Default cap on the memory used by the stored run history, in megabytes
+DEFAULT_MEMORY_CAP = 256
+
+# Rough memory cost of one stored value: a Python float held in a list plus the copies the graphs keep
+BYTES_PER_VALUE = 64
+
+# Each display tier averages this many rows of the tier below it into one
+TIER_FACTOR = 10
+
+# Number of display tiers, rows falling out of the last one are only kept on disk
+TIER_COUNT = 5
+
+
+# Averages every factor rows of each column into one row, missing values are left out of the average
+def downsampleColumns(columns, factor):
+    result = {}
+    for name, values in columns.items():
+        blocks = np.asarray(values, dtype=np.float64).reshape(-1, factor)
+        finite = np.isfinite(blocks)
+        counts = finite.sum(axis=1)
+        totals = np.where(finite, blocks, 0.0).sum(axis=1)
+        result[name] = np.divide(totals, counts, out=np.full(len(blocks), np.nan), where=counts > 0)
+    return result
+
+
+# Joins dictionaries of column arrays end to end, columns missing from a part are filled with NaN
+def concatColumns(parts, names):
+    return {name: np.concatenate([np.asarray(part[name], dtype=np.float64) if name in part
+                                  else np.full(len(next(iter(part.values()))), np.nan) for part in parts])
+            for name in names}
+
+
+# Keeps the memory used by a run's history under a cap for long unattended runs
+# The newest rows stay in memory at full resolution, older ones are spilled to disk in chunks and also
+# averaged into display tiers that get coarser with age, so the graphs can still show the whole run
+class TieredRetention:
+    def __init__(self, memoryCap=DEFAULT_MEMORY_CAP, spillDirectory=None):
+        self.memoryCap = memoryCap
+        self.spillDirectory = spillDirectory
+        self.ownsDirectory = spillDirectory is None
+
+        # Spilled chunk files in order, with the columns each one holds
+        self.chunks = []
+
+        # Display tiers from finest to coarsest, each a dictionary of column arrays
+        self.tiers = [{} for _ in range(TIER_COUNT)]
+
+        # Chunk files are written on a background thread so a spill never holds up the GUI
+        self.writer = ThreadPoolExecutor(max_workers=1)
+        self.pendingWrites = deque()
+
+    def rowLimits(self, columnCount):
+        # Most of the cap goes to the full resolution rows, the rest is shared by the display tiers
+        # The cap can be a fraction of a megabyte, but row counts have to be whole numbers
+        budget = int(self.memoryCap * 1024 * 1024) // (columnCount * BYTES_PER_VALUE)
+        recentRows = max(TIER_FACTOR * 100, budget * 3 // 5)
+        tierRows = max(TIER_FACTOR * 10, budget * 2 // 5 // TIER_COUNT)
+        return recentRows, tierRows
+
+    def enforce(self, store):
+        # Spills the oldest half of the in-memory rows once there are more than the cap allows
+        recentRows, tierRows = self.rowLimits(len(store))
+        rowCount = len(store["Elapsed Seconds"])
+        if rowCount <= recentRows:
+            return
+
+        count = (rowCount - recentRows // 2) // TIER_FACTOR * TIER_FACTOR
+        spilled = {name: np.asarray(values[:count], dtype=np.float64) for name, values in store.items()}
+        for values in store.values():
+            del values[:count]
+
+        self.spill(spilled)
+        self.addToTier(0, downsampleColumns(spilled, TIER_FACTOR), tierRows)
+
+    def spill(self, columns):
+        if self.spillDirectory is None:
+            self.spillDirectory = tempfile.mkdtemp(prefix="dataGraphUI-")
+        path = os.path.join(self.spillDirectory, f"chunk{len(self.chunks):06d}.npz")
+        self.chunks.append((path, list(columns)))
+
+        # Waits for older writes when the disk falls behind, so queued chunks cannot pile up in memory
+        while len(self.pendingWrites) > 2:
+            self.pendingWrites.popleft().result()
+        self.pendingWrites.append(self.writer.submit(np.savez, path, *columns.values()))
+
+    def addToTier(self, level, columns, tierRows):
+        tier = self.tiers[level]
+        names = list(dict.fromkeys([*tier, *columns]))
+        tier = concatColumns([tier, columns], names) if tier else columns
+        rowCount = len(tier["Elapsed Seconds"])
+
+        # The oldest half of a full tier moves down into the next, coarser tier
+        if rowCount > tierRows:
+            count = (rowCount - tierRows // 2) // TIER_FACTOR * TIER_FACTOR
+            older = {name: values[:count] for name, values in tier.items()}
+            tier = {name: values[count:] for name, values in tier.items()}
+            if level + 1 < TIER_COUNT:
+                self.addToTier(level + 1, downsampleColumns(older, TIER_FACTOR), tierRows)
+
+        self.tiers[level] = tier
+
+    def displayData(self, store):
+        # The whole run for the graphs: coarsest tiers first, then the full resolution rows
+        tiers = [tier for tier in reversed(self.tiers) if tier]
+        if not tiers:
+            return store
+        return concatColumns([*tiers, store], list(store))
+
+    def waitForWrites(self):
+        while self.pendingWrites:
+            self.pendingWrites.popleft().result()
+
+    def readChunks(self):
+        # Yields each spilled chunk as a data frame, oldest first
+        self.waitForWrites()
+        for path, names in self.chunks:
+            with np.load(path) as chunk:
+                yield pd.DataFrame({name: chunk[f"arr_{i}"] for i, name in enumerate(names)})
+
+    def fullFrame(self, store):
+        # Every row of the run at full resolution, read back from disk
+        frames = [*self.readChunks(), pd.DataFrame(store)]
+        return pd.concat(frames, ignore_index=True)[self.allColumns(store)]
+
+    def allColumns(self, store):
+        return list(dict.fromkeys([name for _, names in self.chunks for name in names] + list(store)))
+
+    def saveCsv(self, filename, store):
+        # Writes the run one chunk at a time so saving never needs the whole run in memory
+        columns = self.allColumns(store)
+        pd.DataFrame(columns=columns).to_csv(filename, index=False)
+        for frame in [*self.readChunks(), pd.DataFrame(store)]:
+            frame.reindex(columns=columns).to_csv(filename, mode="a", header=False, index=False)
+
+    def clear(self):
+        # Deletes the spilled chunks and display tiers of the last run
+        self.waitForWrites()
+        for path, _ in self.chunks:
+            if os.path.exists(path):
+                os.remove(path)
+        self.chunks = []
+        self.tiers = [{} for _ in range(TIER_COUNT)]
+
+    def close(self):
+        self.clear()
+        self.writer.shutdown()
+        if self.ownsDirectory and self.spillDirectory is not None:
+            shutil.rmtree(self.spillDirectory, ignore_errors=True)
+            self.spillDirectory = None
+
+
 # Widget that handles the acquirement of data and how to store it
 class DataHandler(QWidget):
-    def __init__(self):
+    # Signal that passes on failures reading the external sensor logs
+    sensorErrorSignal = pyqtSignal(str)
+
+    def __init__(self, memoryCap=DEFAULT_MEMORY_CAP, spillDirectory=None):
         super().__init__()
         # Sets up the data frame dictionary that stores that data plot points
         self.dataFrameSetup = {
@@ -221,12 +880,44 @@ class DataHandler(QWidget):
             "Flow Rate": []
         }
 
+        # Tracks how far each sample lands from its expected acquisition time
+        self.acquisitionJitter = TimingStats()
+        self.lastAcquiredAt = None
+
+        # Shared memory path, only set up when acquisition runs in its own process
+        self.sharedBuffer = None
+        self.acquisition = None
+        self.sharedOffset = None
+
+        # External sensor logs, only set up once the user adds a file to follow
+        # Their rows wait in externalPending until a sample of ours is taken at or after their timestamp
+        self.ingest = None
+        self.externalPending = pd.DataFrame({"Epoch": []})
+        self.externalLast = {}
+
+        # Unix time of the start of the run, used to line up external timestamps with elapsed seconds
+        self.runStartWall = None
+
+        # Keeps the history under the memory cap by spilling old rows to disk, see TieredRetention
+        self.retention = TieredRetention(memoryCap, spillDirectory)
+
+    def recordAcquisition(self, acquiredAt, time_elapsed):
+        # Jitter is how much the time between two samples differs from the acquisition interval
+        if self.lastAcquiredAt is not None:
+            self.acquisitionJitter.add(abs(acquiredAt - self.lastAcquiredAt - ACQUISITION_INTERVAL))
+        self.lastAcquiredAt = acquiredAt
+
+        # The first sample of a run marks when the run started in wall clock time
+        if self.runStartWall is None:
+            self.runStartWall = time.time() - (time.monotonic() - acquiredAt) - time_elapsed
+
     # Generates data for testing purposes
     def generateData(self, time_elapsed):
         # Generates random data to fill graph plot points
         temperature = round(random.uniform(20, 50), 2)
         pH = round(random.uniform(6, 8), 2)
         flowRate = round(random.uniform(5, 25), 2)
+        self.recordAcquisition(time.monotonic(), time_elapsed)
 
         # Adding in the new data
         self.dataFrameSetup["Elapsed Seconds"].append(time_elapsed)
@@ -234,16 +925,138 @@ class DataHandler(QWidget):
         self.dataFrameSetup["pH"].append(pH)
         self.dataFrameSetup["Flow Rate"].append(flowRate)
         self.currentData = {"Time Elapsed": time_elapsed, "Temperature": temperature, "pH": pH, "Flow Rate": flowRate}
-
-        return self.dataFrameSetup, self.currentData
+        self.mergeExternalData(1)
+        self.retention.enforce(self.dataFrameSetup)
+
+        return self.displayData(), self.currentData
+
+    def startAcquisitionProcess(self):
+        # Creates the shared memory ring buffer and starts the process that fills it
+        self.sharedBuffer = SharedDataBuffer(create=True)
+        self.stopEvent = Event()
+        self.acquisition = Process(target=acquisitionProcess, args=(self.sharedBuffer.name, self.stopEvent),
+                                   daemon=True)
+        self.acquisition.start()
+
+    def stopAcquisitionProcess(self):
+        # Stops the acquisition process and releases the shared memory
+        if self.acquisition is not None:
+            self.stopEvent.set()
+            self.acquisition.join(timeout=ACQUISITION_INTERVAL * 2)
+            self.acquisition = None
+        if self.sharedBuffer is not None:
+            self.sharedBuffer.close()
+            self.sharedBuffer = None
+
+    # Called when the timer is started again after being stopped
+    def resumeData(self, time_elapsed):
+        # The pause is not acquisition jitter, so the next sample starts a fresh interval
+        self.lastAcquiredAt = None
+
+        # Elapsed time leaves the pause out, so the run start is moved forward by it to keep external
+        # timestamps lined up with the samples
+        if self.runStartWall is not None:
+            self.runStartWall = time.time() - time_elapsed
+
+        # The acquisition process keeps writing while the timer is stopped, those rows are skipped and the
+        # next sample is lined up with the timer again, which does not count the paused time
+        if self.sharedBuffer is not None:
+            self.sharedBuffer.skipToLatest()
+            self.sharedOffset = None
+
+    # Reads the samples the acquisition process wrote since the last call
+    def readSharedData(self, time_elapsed):
+        newRows = self.sharedBuffer.readNew()
+
+        # On the first read of a run, only the latest sample is kept and its time is lined up with the timer
+        if self.sharedOffset is None and len(newRows):
+            newRows = newRows[-1:]
+            self.sharedOffset = newRows[0, 4] - time_elapsed
+
+        for row in newRows:
+            self.recordAcquisition(row[4], round(row[4] - self.sharedOffset, 3))
+            self.dataFrameSetup["Elapsed Seconds"].append(round(row[4] - self.sharedOffset, 3))
+            self.dataFrameSetup["Temperature"].append(float(row[1]))
+            self.dataFrameSetup["pH"].append(float(row[2]))
+            self.dataFrameSetup["Flow Rate"].append(float(row[3]))
+
+        # Nothing new arrived this tick
+        if not len(newRows):
+            return self.displayData(), None
+
+        row = newRows[-1]
+        self.currentData = {"Time Elapsed": round(row[4] - self.sharedOffset, 3), "Temperature": float(row[1]),
+                            "pH": float(row[2]), "Flow Rate": float(row[3])}
+        self.mergeExternalData(len(newRows))
+        self.retention.enforce(self.dataFrameSetup)
+
+        return self.displayData(), self.currentData
+
+    # Adds a batch of rows at once, given as a dictionary of equal length columns
+    def appendRows(self, columns):
+        for name, values in columns.items():
+            self.dataFrameSetup[name].extend(np.asarray(values).tolist())
+        self.retention.enforce(self.dataFrameSetup)
+
+    # Data for the graphs, older parts of a long run come back averaged down
+    def displayData(self):
+        return self.retention.displayData(self.dataFrameSetup)
+
+    # The whole run at full resolution, including what was spilled to disk
+    def fullFrame(self):
+        return self.retention.fullFrame(self.dataFrameSetup)
+
+    def addSensorFile(self, path, timeColumn=None):
+        # Starts following an instrument's CSV log, its columns show up as extra channels
+        if self.ingest is None:
+            self.ingest = SensorFileIngest()
+            self.ingest.errorSignal.connect(self.sensorErrorSignal)
+        self.ingest.addFile(path, timeColumn)
+
+    def stopSensorIngest(self):
+        if self.ingest is not None:
+            self.ingest.stop()
+            self.ingest = None
+
+    # Lines the external sensor rows up with the last newly added samples by timestamp
+    # Each sample gets the latest external value at or before its own time, so every channel keeps the same length
+    def mergeExternalData(self, count):
+        if self.ingest is None:
+            return
+
+        frames = self.ingest.drain()
+        if frames:
+            self.externalPending = pd.concat([self.externalPending, *frames], ignore_index=True)
+
+        rowTimes = np.asarray(self.dataFrameSetup["Elapsed Seconds"][-count:], dtype=np.float64) + self.runStartWall
+        total = len(self.dataFrameSetup["Elapsed Seconds"])
+        channels = list(self.externalLast) + [column for column in self.externalPending.columns
+                                              if column != "Epoch" and column not in self.externalLast]
+
+        for channel in channels:
+            last = self.externalLast.get(channel, np.nan)
+            if channel in self.externalPending:
+                samples = self.externalPending[["Epoch", channel]].dropna().sort_values("Epoch", kind="stable")
+                times, values = samples["Epoch"].to_numpy(), samples[channel].to_numpy()
+            else:
+                times, values = np.empty(0), np.empty(0)
+
+            index = np.searchsorted(times, rowTimes, side="right") - 1
+            merged = np.where(index >= 0, values[np.maximum(index, 0)], last) if len(values) else np.full(count, last)
+            self.externalLast[channel] = merged[-1]
+
+            # Channels that show up partway through a run are padded so they line up with the rest
+            column = self.dataFrameSetup.setdefault(channel, [np.nan] * (total - count))
+            column.extend(merged.tolist())
+
+        # Rows up to the newest sample have been used, later ones wait for the next tick
+        self.externalPending = compactSensorRows(
+            self.externalPending[self.externalPending["Epoch"] > rowTimes[-1]], rowTimes[-1])
 
     # Function that saves the stored data into a csv text file
     def saveData(self, filename="data.csv"):
-        # Puts the data from dictionary into a pandas dataframe
-        self.dataFrame = pd.DataFrame(self.dataFrameSetup)
-
-        # Saves the new data frame into a csv file
-        self.dataFrame.to_csv(filename, index=False)
+        # Saves the spilled chunks and the rows still in memory into a csv file, one part at a time
+        self.retention.saveCsv(filename, self.dataFrameSetup)
         QMessageBox.information(None, "Save Data", f"Data saved to {filename}")
 
     def clearData(self):
@@ -254,6 +1067,221 @@ class DataHandler(QWidget):
             "pH": [],
             "Flow Rate": []
         }
+        self.lastAcquiredAt = None
+        self.sharedOffset = None
+        self.externalLast = {}
+        self.runStartWall = None
+        self.retention.clear()
+
+
+# Above this many channels the overlay graph draws everything as one batched path
+BATCHED_CHANNEL_THRESHOLD = 8
+
+
+# Tries to switch a graph over to OpenGL rendering, keeps software rendering if GL is not available
+def enableOpenGL(plotWidget):
+    context = QOpenGLContext()
+    if not context.create():
+        return False
+    try:
+        plotWidget.useOpenGL(True)
+    except Exception:
+        plotWidget.useOpenGL(False)
+        return False
+    return True
+
+
+# Scales each channel to the 0-1 range and joins them into one set of arrays for a single draw call
+# The connect array breaks the line between the end of one channel and the start of the next,
+# and around missing (NaN) values
+def normalizeChannels(x, channels):
+    x = np.asarray(x, dtype=np.float64)
+    count = len(x)
+    xAll = np.tile(x, len(channels))
+    yAll = np.empty(count * len(channels))
+    connect = np.ones(count * len(channels), dtype=bool)
+
+    for i, values in enumerate(channels):
+        values = np.asarray(values, dtype=np.float64)
+        finite = np.isfinite(values)
+        low, high = (values[finite].min(), values[finite].max()) if finite.any() else (0.0, 0.0)
+        span = high - low
+
+        # Flat channels are drawn through the middle of the axis
+        scaled = (values - low) / span if span > 0 else np.full(count, 0.5)
+        scaled[~finite] = np.nan
+        yAll[i * count:(i + 1) * count] = scaled
+
+        segment = connect[i * count:(i + 1) * count]
+        segment[:-1] = finite[:-1] & finite[1:]
+        segment[-1:] = False
+
+    return xAll, yAll, connect
+
+
+# Draws any number of channels on the overlay graph, each normalized so they can share the axis
+# Few channels get their own reused curve and color, many channels are batched into one curve
+class OverlayRenderer:
+    def __init__(self, plotWidget, batched=None):
+        self.plotWidget = plotWidget
+        self.curves = {}
+        self.batchedCurve = None
+
+        # None picks the drawing mode from the channel count, True or False forces one
+        self.batched = batched
+
+    def draw(self, x, series):
+        batched = len(series) > BATCHED_CHANNEL_THRESHOLD if self.batched is None else self.batched
+        if batched:
+            self.drawBatched(x, series)
+        else:
+            self.drawCurves(x, series)
+
+    def drawCurves(self, x, series):
+        for i, (name, values) in enumerate(series.items()):
+            xNorm, yNorm, _ = normalizeChannels(x, [values])
+            if name not in self.curves:
+                self.curves[name] = self.plotWidget.plot(pen=styleCache.pen(name, 3, i, len(series)), name=name)
+            self.curves[name].setData(xNorm, yNorm, connect="finite")
+
+    def drawBatched(self, x, series):
+        xAll, yAll, connect = normalizeChannels(x, list(series.values()))
+        if self.batchedCurve is None:
+            self.batchedCurve = self.plotWidget.plot(pen=styleCache.pen("Batched", 1))
+        self.batchedCurve.setData(xAll, yAll, connect=connect)
+
+    def applyTheme(self):
+        # Swaps in the pens of the current theme without recreating the curves
+        for i, (name, curve) in enumerate(self.curves.items()):
+            curve.setPen(styleCache.pen(name, 3, i, len(self.curves)))
+        if self.batchedCurve is not None:
+            self.batchedCurve.setPen(styleCache.pen("Batched", 1))
+
+    def clear(self):
+        self.plotWidget.clear()
+        self.curves = {}
+        self.batchedCurve = None
+
+
+# Measures the average time to draw one frame of the overlay graph at different channel counts,
+# once with a curve per channel and once with all channels batched into one curve
+def benchmarkOverlay(channelCounts=(8, 32, 128), samples=2000, frames=30, useOpenGL=False):
+    results = {}
+    for channelCount, batched in [(count, batched) for count in channelCounts for batched in (False, True)]:
+        plotWidget = pg.PlotWidget()
+        plotWidget.resize(1000, 600)
+        openGL = enableOpenGL(plotWidget) if useOpenGL else False
+        plotWidget.show()
+        renderer = OverlayRenderer(plotWidget, batched)
+
+        x = np.arange(samples)
+        series = {f"Channel {i}": np.random.uniform(0, 100, samples) for i in range(channelCount)}
+
+        frameTimes = TimingStats()
+        for _ in range(frames):
+            frameStart = time.perf_counter()
+            renderer.draw(x, series)
+            plotWidget.viewport().repaint()
+            frameTimes.add(time.perf_counter() - frameStart)
+
+        results[channelCount, batched] = dict(frameTimes.summary(), openGL=openGL)
+        plotWidget.close()
+    return results
+
+
+# Measures how long the main window takes to build and how many memory blocks one graph update allocates
+def benchmarkStartup(runs=5, ticks=20):
+    import tracemalloc
+
+    startupTimes = TimingStats()
+    for _ in range(runs):
+        startupStart = time.perf_counter()
+        window = MainWindow()
+        startupTimes.add(time.perf_counter() - startupStart)
+        window.close()
+
+    # Fills the graphs first so the measured ticks are past the one-time curve setup
+    window.dataWidget.trackerFrame.targetValuesSetup(None)
+    for tick in range(1, ticks + 1):
+        window.dataWidget.plotGraph(tick * ACQUISITION_INTERVAL)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for tick in range(ticks + 1, 2 * ticks + 1):
+        window.dataWidget.plotGraph(tick * ACQUISITION_INTERVAL)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    difference = after.compare_to(before, "filename")
+    return {"startup": startupTimes.summary(),
+            "blocksPerTick": sum(stat.count_diff for stat in difference) / ticks,
+            "bytesPerTick": sum(stat.size_diff for stat in difference) / ticks}
+
+
+# Measures how fast replaySweep works through a long simulated pH run
+def benchmarkReplay(samples=2_000_000):
+    times = np.arange(samples) * ACQUISITION_INTERVAL
+    values = np.round(np.random.uniform(6, 8, samples), 2)
+    targets = parseGrid("7.0:7.2:0.02")
+    margins = parseGrid("0.02:0.2:0.02")
+
+    replayStart = time.perf_counter()
+    replaySweep(times, values, targets, margins)
+    seconds = time.perf_counter() - replayStart
+
+    combinations = len(targets) * len(margins)
+    return {"samples": samples, "combinations": combinations, "seconds": seconds,
+            "samplesPerSecond": samples * combinations / seconds}
+
+
+# Current resident memory of this process in bytes
+def residentMemory():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Not on Linux, falls back to the peak resident memory
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+# Feeds simulated weeks of data at a high rate through the main window's history and graphs, as an
+# unattended run would, and yields the resident memory after every simulated 12 hours, which should level
+# off under the cap
+def soakTest(days=21, rate=10, memoryCap=64, batchSeconds=600):
+    window = MainWindow(memoryCap=memoryCap)
+    window.show()
+    dataWidget = window.dataWidget
+    handler = dataWidget.handleData
+    batchRows = rate * batchSeconds
+    batchesPerReport = 12 * 3600 // batchSeconds
+    step = 1 / rate
+
+    try:
+        for batch in range(days * 86400 // batchSeconds):
+            elapsed = batch * batchSeconds + np.arange(batchRows) * step
+            handler.appendRows({"Elapsed Seconds": elapsed,
+                                "Temperature": np.round(np.random.uniform(20, 50, batchRows), 2),
+                                "pH": np.round(np.random.uniform(6, 8, batchRows), 2),
+                                "Flow Rate": np.round(np.random.uniform(5, 25, batchRows), 2)})
+
+            # Updates the graphs like a timer tick would, so the curves' own buffers are part of the measurement
+            newData = handler.displayData()
+            dataWidget.plotTempGraph(newData)
+            dataWidget.plotPHGraph(newData)
+            dataWidget.plotFlowRateGraph(newData)
+            dataWidget.plotAllGraph(newData)
+            QApplication.processEvents()
+
+            if (batch + 1) % batchesPerReport == 0:
+                # Painting every graph is slow on a long run, so they are only painted before each report
+                for graph in (dataWidget.all_graph, *dataWidget.curveGraphs.values()):
+                    dataWidget.graphTabs.setCurrentWidget(graph)
+                    graph.viewport().repaint()
+                yield (batch + 1) * batchSeconds / 86400, residentMemory()
+    finally:
+        window.close()
 
 
 # Handles the main data shown in the UI with graphs
@@ -261,11 +1289,24 @@ class DataWidget(QWidget):
     # Signal that sends newly received data point to the tracker widget
     dataPointSignal = pyqtSignal(dict)
 
-    def __init__(self, parent=None, timer_app=None, target_app=None):
+    def __init__(self, parent=None, timer_app=None, target_app=None, useSharedMemory=False, useOpenGL=False,
+                 memoryCap=DEFAULT_MEMORY_CAP):
         super().__init__(parent)
 
         # Establishing the DataHandler Object
-        self.handleData = DataHandler()
+        self.handleData = DataHandler(memoryCap)
+        self.handleData.sensorErrorSignal.connect(self.showSensorError)
+
+        # When enabled, samples come from a separate acquisition process through shared memory
+        self.useSharedMemory = useSharedMemory
+        if useSharedMemory:
+            self.handleData.startAcquisitionProcess()
+
+        # Tracks how long each graph update takes
+        self.frameTimes = TimingStats()
+
+        # OpenGL rendering for the overlay graph, only turned on if the machine supports it
+        self.useOpenGL = useOpenGL
 
         # Setup frames for the Data widgets and structure
         self.dataPanelFrame = QFrame(self)
@@ -307,16 +1348,12 @@ class DataWidget(QWidget):
         # Slots for graph functions run by timer actions
         timer_app.timerSignal.connect(self.plotGraph)
         timer_app.resetSignal.connect(self.clearGraph)
+        timer_app.resumeSignal.connect(self.handleData.resumeData)
 
     def dataTabSetup(self):
         # Setup Data label as header of the tabs
         self.DataLabel = QLabel(self.dataTabFrame)
-        font = QFont()
-        font.setFamily("Rockwell Extra Bold")
-        font.setPointSize(18)
-        font.setBold(True)
-        font.setUnderline(True)
-        self.DataLabel.setFont(font)
+        self.DataLabel.setFont(styleCache.font("title"))
         self.DataLabel.setObjectName("DataLabel")
         self.DataLabel.setText("Data")
         self.verticalLayout_3.addWidget(self.DataLabel, 0, Qt.AlignHCenter)
@@ -324,10 +1361,7 @@ class DataWidget(QWidget):
         # Setting up the tab widget that hold the data graphs
         self.graphTabs = QTabWidget(self.dataTabFrame)
         self.graphTabs.setMinimumSize(QSize(500, 500))
-        font = QFont()
-        font.setFamily("Rockwell")
-        font.setPointSize(12)
-        self.graphTabs.setFont(font)
+        self.graphTabs.setFont(styleCache.font("tabs"))
         self.graphTabs.setTabShape(QTabWidget.Rounded)
         self.graphTabs.setObjectName("graphTabs")
 
@@ -340,11 +1374,32 @@ class DataWidget(QWidget):
         # Adding the graph tabs to the layout
         self.verticalLayout_3.addWidget(self.graphTabs)
 
+        # Curve on each single variable graph, created on the first plot and updated in place afterwards
+        self.curves = {}
+        self.curveGraphs = {"Temperature": self.temp_graph, "pH": self.pH_graph, "Flow Rate": self.flowRate_graph}
+
+        # Target band and out of band samples from a what-if replay, shown on top of a variable's graph
+        self.replayGraph = None
+        self.replayBand = None
+        self.replayPoints = None
+
+        # Graphs follow the shared theme and are restyled in place when it changes
+        self.applyTheme()
+        styleCache.themeChanged.connect(self.applyTheme)
+
     def allTabSetup(self):
         # Initialize the tab
         self.all_graph = pg.PlotWidget()
         self.all_graph.showGrid(x=True, y=True)
+        self.all_graph.setLabel("left", "Normalized Value")
+        self.all_graph.setLabel("bottom", "Time (sec)")
+        self.all_graph.addLegend()
         self.all_graph.setObjectName("all")
+        if self.useOpenGL:
+            self.useOpenGL = enableOpenGL(self.all_graph)
+
+        # Renderer that keeps and updates the curves of the overlay graph
+        self.allRenderer = OverlayRenderer(self.all_graph)
 
         # Adds graph to the tab
         self.graphTabs.addTab(self.all_graph, "All")
@@ -381,8 +1436,16 @@ class DataWidget(QWidget):
         self.graphTabs.addTab(self.flowRate_graph, "Flow Rate")
 
     def plotGraph(self, time_elapsed):
-        # Generates random data to fill graph plot points
-        newData, currentData = self.handleData.generateData(time_elapsed)
+        frameStart = time.perf_counter()
+
+        if self.useSharedMemory:
+            # Picks up whatever the acquisition process has written since the last tick
+            newData, currentData = self.handleData.readSharedData(time_elapsed)
+            if currentData is None:
+                return
+        else:
+            # Generates random data to fill graph plot points
+            newData, currentData = self.handleData.generateData(time_elapsed)
 
         # Plotting the graphs
         self.plotTempGraph(newData)
@@ -392,42 +1455,96 @@ class DataWidget(QWidget):
 
         # Sends signal of current Data dict to the tracker manager
         self.dataPointSignal.emit(currentData)
+        self.frameTimes.add(time.perf_counter() - frameStart)
+
+    def plotVariableGraph(self, name, newData):
+        # Creates the variable's curve the first time, after that only its data is replaced
+        if name not in self.curves:
+            self.curves[name] = self.curveGraphs[name].plot(pen=styleCache.pen(name), symbol="o",
+                                                             symbolBrush=styleCache.brush(name))
+
+            # Long runs only draw the visible part, thinned down to what the screen can show
+            self.curves[name].setClipToView(True)
+            self.curves[name].setDownsampling(auto=True, method="peak")
+        self.curves[name].setData(newData["Elapsed Seconds"], newData[name])
 
     def plotTempGraph(self, newData):
         # Plots the Temp Graph with given data
-        pen = pg.mkPen(color=(175, 60, 60), width=3)
-        self.temp_graph.plot(newData["Elapsed Seconds"], newData["Temperature"], pen=pen, symbol="o")
+        self.plotVariableGraph("Temperature", newData)
 
     def plotPHGraph(self, newData):
         # Plots the pH Graph with given data
-        pen = pg.mkPen(color=(48, 172, 85), width=3)
-        self.pH_graph.plot(newData["Elapsed Seconds"], newData["pH"], pen=pen, symbol="o")
+        self.plotVariableGraph("pH", newData)
 
     def plotFlowRateGraph(self, newData):
         # Plots the Flow Rate Graph with given data
-        pen = pg.mkPen(color=(76, 87, 186), width=3)
-        self.flowRate_graph.plot(newData["Elapsed Seconds"], newData["Flow Rate"], pen=pen, symbol="o")
+        self.plotVariableGraph("Flow Rate", newData)
 
     def plotAllGraph(self, newData):
-        # Plotting all temp, pH, and flow rate graphs in one graph here
-        pen = pg.mkPen(color=(175, 60, 60), width=3)
-        self.all_graph.plot(newData["Elapsed Seconds"], newData["Temperature"], pen=pen)
-
-        pen = pg.mkPen(color=(48, 172, 85), width=3)
-        self.all_graph.plot(newData["Elapsed Seconds"], newData["pH"], pen=pen)
-
-        pen = pg.mkPen(color=(76, 87, 186), width=3)
-        self.all_graph.plot(newData["Elapsed Seconds"], newData["Flow Rate"], pen=pen)
+        # Plotting every variable in one graph here, each scaled to its own range so they share the axis
+        series = {name: values for name, values in newData.items() if name != "Elapsed Seconds"}
+        self.allRenderer.draw(newData["Elapsed Seconds"], series)
 
     def clearGraph(self):
         # Clears the data from Data Handler side
         self.handleData.clearData()
+        self.handleData.acquisitionJitter.clear()
+        self.frameTimes.clear()
 
         # Clears the graphs
         self.temp_graph.clear()
         self.pH_graph.clear()
         self.flowRate_graph.clear()
-        self.all_graph.clear()
+        self.curves = {}
+        self.allRenderer.clear()
+        self.replayGraph = None
+
+    def applyTheme(self):
+        # Restyles the graphs and swaps in the current theme's pens without recreating any curves
+        for graph in (self.all_graph, self.temp_graph, self.pH_graph, self.flowRate_graph):
+            styleCache.styleGraph(graph)
+        for name, curve in self.curves.items():
+            curve.setPen(styleCache.pen(name))
+            curve.setSymbolBrush(styleCache.brush(name))
+        self.allRenderer.applyTheme()
+        if self.replayGraph is not None:
+            self.replayBand.setBrush(styleCache.brush("Band"))
+            self.replayPoints.setPen(styleCache.pen("Warning", 2))
+
+    def showReplayOverlay(self, name, times, values, target, margin):
+        # Shows the target band on the variable's graph and marks the samples that would have been out of it
+        self.clearReplayOverlay()
+        times = np.asarray(times, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        finite = np.isfinite(values)
+        warning = (classifyStatus(values, target, margin) == 2) & finite
+        low, high = target - margin, target + margin
+        points = values[warning]
+
+        # Channels without a graph of their own, like external sensors, are shown on the All graph
+        # Band and markers are scaled to the channel's range the same way its curve is normalized there
+        if name in self.curveGraphs:
+            self.replayGraph = self.curveGraphs[name]
+        else:
+            self.replayGraph = self.all_graph
+            bottom = values[finite].min() if finite.any() else 0.0
+            span = values[finite].max() - bottom if finite.any() else 0.0
+            scale = (lambda v: (v - bottom) / span) if span > 0 else (lambda v: v - bottom + 0.5)
+            low, high, points = scale(low), scale(high), scale(points)
+
+        self.replayBand = pg.LinearRegionItem((low, high), orientation="horizontal", movable=False,
+                                              brush=styleCache.brush("Band"))
+        self.replayPoints = pg.ScatterPlotItem(times[warning], points, symbol="x", size=10,
+                                               pen=styleCache.pen("Warning", 2))
+        self.replayGraph.addItem(self.replayBand)
+        self.replayGraph.addItem(self.replayPoints)
+        self.graphTabs.setCurrentWidget(self.replayGraph)
+
+    def clearReplayOverlay(self):
+        if self.replayGraph is not None:
+            self.replayGraph.removeItem(self.replayBand)
+            self.replayGraph.removeItem(self.replayPoints)
+            self.replayGraph = None
 
     def saveData(self):
         # Opens up the file to save data to csv, user managed
@@ -440,22 +1557,202 @@ class DataWidget(QWidget):
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to save data: {e}")
 
+    def addSensorFile(self):
+        # Lets the user pick an instrument's CSV log to follow while it is being written
+        filename, _ = QFileDialog.getOpenFileName(self, "Add Sensor Log", "", "CSV Files (*.csv);;All Files (*)")
+        if filename:
+            self.handleData.addSensorFile(filename)
+
+    def showSensorError(self, message):
+        QMessageBox.critical(self, "Error", message)
+
+
+# Dialog that replays a recorded run through the status logic with other targets and margins
+# Results come out as a table, picking a row shows that target band on the variable's graph, or on the
+# All graph for channels that have no graph of their own
+class ReplayDialog(QDialog):
+    def __init__(self, parent=None, data_app=None):
+        super().__init__(parent)
+        self.dataWidget = data_app
+
+        # Run loaded from a saved csv file, None means the current run is replayed
+        self.runData = None
+        self.results = None
+
+        # Data and variable of the last replay, kept so picking table rows does not read the run again
+        self.replayData = None
+        self.replayName = None
+
+        self.setWindowTitle("What-if Replay")
+        self.resize(700, 600)
+        self.setupUI()
+
+    def setupUI(self):
+        layout = QVBoxLayout(self)
+        formLayout = QFormLayout()
+
+        # Where the replayed data comes from
+        self.sourceLabel = QLabel("Current run", self)
+        self.loadButton = QPushButton("Load Run...", self)
+        self.loadButton.pressed.connect(self.loadRun)
+        sourceLayout = QHBoxLayout()
+        sourceLayout.addWidget(self.sourceLabel)
+        sourceLayout.addWidget(self.loadButton)
+        formLayout.addRow("Data:", sourceLayout)
+
+        # Variable to replay and the targets and margins to try
+        self.variableBox = QComboBox(self)
+        self.variableBox.currentTextChanged.connect(self.fillDefaults)
+        formLayout.addRow("Variable:", self.variableBox)
+
+        self.targetInput = QLineEdit(self)
+        self.targetInput.setToolTip("Targets to try, either start:stop:step or a comma separated list")
+        formLayout.addRow("Targets:", self.targetInput)
+
+        self.marginInput = QLineEdit(self)
+        self.marginInput.setToolTip("Margins to try, either start:stop:step or a comma separated list")
+        formLayout.addRow("Margins:", self.marginInput)
+        layout.addLayout(formLayout)
+
+        self.replayButton = QPushButton("Replay", self)
+        self.replayButton.setFont(styleCache.font("status"))
+        self.replayButton.pressed.connect(self.runReplay)
+        layout.addWidget(self.replayButton)
+
+        # Summary table, one row per target and margin
+        self.resultTable = QTableWidget(self)
+        self.resultTable.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.resultTable.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.resultTable.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.resultTable.itemSelectionChanged.connect(self.showSelectedRow)
+        layout.addWidget(self.resultTable)
+
+        self.fillVariables()
+
+    def runFrame(self):
+        # Data that is replayed, as a data frame
+        # For the current run this reads everything spilled to disk back in, so it is only done once per replay
+        if self.runData is not None:
+            return self.runData
+        return self.dataWidget.handleData.fullFrame()
+
+    def fillVariables(self):
+        # Only columns holding numbers can be replayed, the current run only holds numbers
+        if self.runData is not None:
+            columns = [column for column in self.runData.columns
+                       if pd.api.types.is_numeric_dtype(self.runData[column])]
+        else:
+            handleData = self.dataWidget.handleData
+            columns = handleData.retention.allColumns(handleData.dataFrameSetup)
+        self.variableBox.clear()
+        self.variableBox.addItems([column for column in columns if column != "Elapsed Seconds"])
+
+    def fillDefaults(self, name):
+        # Starts from the live target and margin of the variable when there is one
+        targetValues = getattr(self.dataWidget.trackerFrame, "targetValues", None)
+        if targetValues and name in targetValues:
+            self.targetInput.setText(str(targetValues[name]))
+        if name in STATUS_MARGINS:
+            self.marginInput.setText(str(STATUS_MARGINS[name]))
+
+    def loadRun(self):
+        # Opens a run saved through File > Save
+        filename, _ = QFileDialog.getOpenFileName(self, "Load Run", "", "CSV Files (*.csv);;All Files (*)")
+        if filename:
+            try:
+                runData = pd.read_csv(filename)
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to load run: {e}")
+                return
+
+            # Only runs saved by this app can be replayed, they need a numeric Elapsed Seconds column
+            if ("Elapsed Seconds" not in runData.columns or
+                    not pd.api.types.is_numeric_dtype(runData["Elapsed Seconds"])):
+                QMessageBox.critical(self, "Error", "Failed to load run: the file has no numeric "
+                                                    "\"Elapsed Seconds\" column. Load a run saved through File > Save.")
+                return
+            self.runData = runData
+            self.sourceLabel.setText(os.path.basename(filename))
+            self.fillVariables()
+
+    def runReplay(self):
+        name = self.variableBox.currentText()
+        try:
+            targets = parseGrid(self.targetInput.text())
+            margins = parseGrid(self.marginInput.text())
+        except ValueError as e:
+            QMessageBox.critical(self, "Error", f"Invalid targets or margins: {e}")
+            return
+        if not name or not len(targets) or not len(margins):
+            return
+
+        # Only the two columns that are replayed are kept around for the graph overlay
+        data = self.runFrame()
+        if data.empty:
+            return
+        self.replayData = data[["Elapsed Seconds", name]] if name in data else data
+        self.replayName = name
+        data = self.replayData
+
+        try:
+            self.results = replaySweep(data["Elapsed Seconds"], data[name], targets, margins)
+        except (KeyError, ValueError, TypeError) as e:
+            QMessageBox.critical(self, "Error", f"Failed to replay {name}: {e}")
+            return
+
+        # Fills in the summary table
+        self.resultTable.clear()
+        self.resultTable.setColumnCount(len(self.results.columns))
+        self.resultTable.setHorizontalHeaderLabels(list(self.results.columns))
+        self.resultTable.setRowCount(len(self.results))
+        for row, values in enumerate(self.results.itertuples(index=False)):
+            for column, value in enumerate(values):
+                self.resultTable.setItem(row, column, QTableWidgetItem(f"{value:.4g}"))
+        self.resultTable.resizeColumnsToContents()
+
+    def showSelectedRow(self):
+        rows = self.resultTable.selectionModel().selectedRows()
+        if not rows or self.results is None:
+            return
+        result = self.results.iloc[rows[0].row()]
+        data, name = self.replayData, self.replayName
+        try:
+            self.dataWidget.showReplayOverlay(name, data["Elapsed Seconds"], data[name], result["Target"],
+                                              result["Margin"])
+        except (KeyError, ValueError, TypeError) as e:
+            QMessageBox.critical(self, "Error", f"Failed to show {name} on its graph: {e}")
+
 
 # Timer Widget setup and functions
 class TimerWidget(QWidget):
     # Timer signal used for updating data
-    timerSignal = pyqtSignal(int)
+    # Carries the elapsed seconds, to the millisecond, at the moment the sample is due
+    timerSignal = pyqtSignal(float)
 
     # Reset timer signal for clearing data
     resetSignal = pyqtSignal()
 
+    # Resume signal for when the timer is started again, carries the elapsed seconds it resumes from
+    resumeSignal = pyqtSignal(float)
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
-        # Time Label and variable to store time data
-        self.time = QTime(0, 0, 0)
+        # Variable to store time data
         self.time_elapsed = 0
 
+        # Time is measured against a monotonic clock so late or merged timeouts do not make it drift
+        # pausedElapsed holds the time counted before the last stop, runStart is when the current run began
+        self.runStart = None
+        self.pausedElapsed = 0.0
+
+        # Index of the last acquisition slot sent out, slots skipped by a late timeout are counted as missed
+        self.lastSlot = 0
+        self.missedSlots = 0
+
+        # Tracks how late each acquisition slot is sent compared to its deadline
+        self.tickJitter = TimingStats()
+
         # Bool flag to track button states
         self.startClicked = False
 
@@ -469,12 +1766,7 @@ class TimerWidget(QWidget):
         # The Timer Header label
         self.watchHeader = QLabel(self)
         self.watchHeader.setMinimumSize(QSize(300, 150))
-        font = QFont()
-        font.setFamily("Rockwell Extra Bold")
-        font.setPointSize(22)
-        font.setBold(True)
-        font.setUnderline(True)
-        self.watchHeader.setFont(font)
+        self.watchHeader.setFont(styleCache.font("timerTitle"))
         self.watchHeader.setFrameShape(QFrame.NoFrame)
         self.watchHeader.setTextFormat(Qt.AutoText)
         self.watchHeader.setAlignment(Qt.AlignCenter)
@@ -493,42 +1785,69 @@ class TimerWidget(QWidget):
         self.timewatch = QLabel(self)
         self.timewatch.setEnabled(True)
         self.timewatch.setMinimumSize(QSize(300, 50))
-        font = QFont()
-        font.setPointSize(28)
-        self.timewatch.setFont(font)
+        self.timewatch.setFont(styleCache.font("clock"))
         self.timewatch.setFrameShape(QFrame.Box)
         self.timewatch.setFrameShadow(QFrame.Plain)
         self.timewatch.setAlignment(Qt.AlignCenter)
         self.timewatch.setObjectName("timewatch")
         self.verticalLayout_7.addWidget(self.timewatch)
-        self.timewatch.setText(self.time.toString("hh:mm:ss"))
+        self.timewatch.setText(formatElapsed(self.time_elapsed))
 
     def timerControl(self):
         # Control sequence for the timer itself
-        eTimer = QTimer(self)
-        eTimer.timeout.connect(self.updateTimer)
-        eTimer.start(1000)
+        # Single shot timer that is re-armed on every timeout to land on the next whole second
+        self.eTimer = QTimer(self)
+        self.eTimer.setTimerType(Qt.PreciseTimer)
+        self.eTimer.setSingleShot(True)
+        self.eTimer.timeout.connect(self.updateTimer)
+        self.eTimer.start(1000)
+
+    def elapsedSeconds(self):
+        # Time counted so far, read from the monotonic clock
+        if self.runStart is None:
+            return self.pausedElapsed
+        return self.pausedElapsed + time.monotonic() - self.runStart
+
+    def scheduleNextTick(self, elapsed):
+        # Waits until the next whole second of elapsed time
+        self.eTimer.start(max(1, int((1 - elapsed % 1) * 1000)))
 
     def updateTimer(self):
         # Detects when the timer is started and tracks the time
-        if self.startClicked:
-            self.time = self.time.addSecs(1)
-            self.timewatch.setText(self.time.toString("hh:mm:ss"))
-            self.time_elapsed += 1
-
-            # Sends a signal to the data side
-            if self.time_elapsed % 2 == 0:
-                self.timerSignal.emit(self.time_elapsed)
+        if not self.startClicked:
+            self.eTimer.start(1000)
+            return
+
+        elapsed = self.elapsedSeconds()
+        self.time_elapsed = int(elapsed)
+        self.timewatch.setText(formatElapsed(self.time_elapsed))
+
+        # Sends a signal to the data side once per slot, with the real elapsed time of the sample
+        slot = int(elapsed // ACQUISITION_INTERVAL)
+        if slot > self.lastSlot:
+            self.missedSlots += slot - self.lastSlot - 1
+            self.tickJitter.add(elapsed - slot * ACQUISITION_INTERVAL)
+            self.lastSlot = slot
+            self.timerSignal.emit(round(elapsed, 3))
+
+        self.scheduleNextTick(elapsed)
+
+    def resetTimer(self):
+        # Starts counting again from zero
+        self.runStart = time.monotonic()
+        self.pausedElapsed = 0.0
+        self.time_elapsed = 0
+        self.lastSlot = 0
+        self.missedSlots = 0
+        self.tickJitter.clear()
+        self.timewatch.setText(formatElapsed(0))
+        self.scheduleNextTick(0)
 
     def startButtonSetup(self):
         # Start button initialized in format
         self.startButton = QPushButton(self)
         self.startButton.setMinimumSize(QSize(0, 25))
-        font = QFont()
-        font.setFamily("Segoe UI Black")
-        font.setPointSize(14)
-        font.setBold(True)
-        self.startButton.setFont(font)
+        self.startButton.setFont(styleCache.font("status"))
         self.startButton.setObjectName("startButton")
         self.verticalLayout_7.addWidget(self.startButton)
         self.startButton.setText("START")
@@ -543,22 +1862,20 @@ class TimerWidget(QWidget):
                                          "A timer is already running. Are you sure you want to restart the timer?",
                                          QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
             if reply == QMessageBox.Yes:
-                self.time = QTime(0, 0, 0)
-                self.time_elapsed = 0
+                self.resetTimer()
                 self.timerSignal.emit(self.time_elapsed)
                 self.resetSignal.emit()
         else:
             self.startClicked = True
+            self.runStart = time.monotonic()
+            self.scheduleNextTick(self.pausedElapsed)
+            self.resumeSignal.emit(self.pausedElapsed)
 
     def stopButtonSetup(self):
         # Stop Button initialized in format
         self.stopButton = QPushButton(self)
         self.stopButton.setMinimumSize(QSize(0, 25))
-        font = QFont()
-        font.setFamily("Segoe UI Black")
-        font.setPointSize(14)
-        font.setBold(True)
-        self.stopButton.setFont(font)
+        self.stopButton.setFont(styleCache.font("status"))
         self.stopButton.setObjectName("stopButton")
         self.verticalLayout_7.addWidget(self.stopButton)
         self.stopButton.setText("STOP")
@@ -573,6 +1890,8 @@ class TimerWidget(QWidget):
                                          QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
             if reply == QMessageBox.Yes:
                 self.startClicked = False
+                self.pausedElapsed = self.elapsedSeconds()
+                self.runStart = None
 
 
 # Temporary setup for the Variable Inputs, currently just for the UI
@@ -614,11 +1933,7 @@ class VariableInputWidget(QWidget):
 
         # Label
         self.tempInputLabel = QLabel(self.tempInputFrame)
-        font = QFont()
-        font.setFamily("Rockwell")
-        font.setPointSize(14)
-        font.setBold(False)
-        self.tempInputLabel.setFont(font)
+        self.tempInputLabel.setFont(styleCache.font("inputLabel"))
         self.tempInputLabel.setObjectName("tempInputLabel")
         self.tempInputLabel.setText("Temperature:")
         self.verticalLayout_9.addWidget(self.tempInputLabel)
@@ -646,10 +1961,7 @@ class VariableInputWidget(QWidget):
 
         # Label
         self.pHInputLabel = QLabel(self.pHInputFrame)
-        font = QFont()
-        font.setFamily("Rockwell")
-        font.setPointSize(14)
-        self.pHInputLabel.setFont(font)
+        self.pHInputLabel.setFont(styleCache.font("inputLabel"))
         self.pHInputLabel.setObjectName("pHInputLabel")
         self.pHInputLabel.setText("pH:")
         self.verticalLayout_10.addWidget(self.pHInputLabel)
@@ -677,10 +1989,7 @@ class VariableInputWidget(QWidget):
 
         # Label
         self.flowRateInputLabel = QLabel(self.flowRateInputFrame)
-        font = QFont()
-        font.setFamily("Rockwell")
-        font.setPointSize(14)
-        self.flowRateInputLabel.setFont(font)
+        self.flowRateInputLabel.setFont(styleCache.font("inputLabel"))
         self.flowRateInputLabel.setObjectName("flowRateInputLabel")
         self.flowRateInputLabel.setText("Flow Rate:")
         self.verticalLayout_11.addWidget(self.flowRateInputLabel)
@@ -724,8 +2033,11 @@ class VariableInputWidget(QWidget):
 
 # Main Window connects whole UI together and other widgets
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, useSharedMemory=False, useOpenGL=False, memoryCap=DEFAULT_MEMORY_CAP):
         super().__init__()
+        self.useSharedMemory = useSharedMemory
+        self.useOpenGL = useOpenGL
+        self.memoryCap = memoryCap
         self.centralwidget = QWidget(self)
         self.centralframe = QFrame(self.centralwidget)
         self.setupUI()
@@ -766,7 +2078,8 @@ class MainWindow(QMainWindow):
         self.horizontalLayout.addWidget(self.sidePanelFrame, 0, Qt.AlignLeft)
 
         # Data/Graph Tabs Setup
-        self.dataWidget = DataWidget(self.centralframe, self.timerWidget, self.inputWidget)
+        self.dataWidget = DataWidget(self.centralframe, self.timerWidget, self.inputWidget, self.useSharedMemory,
+                                     self.useOpenGL, self.memoryCap)
         self.horizontalLayout.addWidget(self.dataWidget.dataPanelFrame)
 
         # Finish set up central widgets
@@ -794,10 +2107,108 @@ class MainWindow(QMainWindow):
         self.menuFile.setTitle("File")
         self.actionSave.setText("Save")
 
+        # Sets up the button to follow an external sensor log
+        self.actionAddSensor = QAction(self)
+        self.actionAddSensor.setStatusTip("Click this to follow a CSV log written by another instrument.")
+        self.actionAddSensor.triggered.connect(self.dataWidget.addSensorFile)
+        self.actionAddSensor.setObjectName("actionAddSensor")
+        self.menuFile.addAction(self.actionAddSensor)
+        self.actionAddSensor.setText("Add Sensor Log...")
+
+        # Theme menu lets the user switch themes live, only one theme can be checked at a time
+        self.menuTheme = QMenu(self.menubar)
+        self.menuTheme.setObjectName("menuTheme")
+        self.menuTheme.setTitle("Theme")
+        self.themeGroup = QActionGroup(self)
+        for themeName in THEMES:
+            action = QAction(themeName, self, checkable=True)
+            action.setChecked(themeName == styleCache.themeName)
+            action.triggered.connect(lambda checked, name=themeName: styleCache.setTheme(name))
+            self.themeGroup.addAction(action)
+            self.menuTheme.addAction(action)
+        self.menubar.addAction(self.menuTheme.menuAction())
+
+        # Analysis menu with the what-if replay of a recorded run
+        self.menuAnalysis = QMenu(self.menubar)
+        self.menuAnalysis.setObjectName("menuAnalysis")
+        self.menuAnalysis.setTitle("Analysis")
+        self.actionReplay = QAction(self)
+        self.actionReplay.setStatusTip("Click this to see how a run would have done with other targets and margins.")
+        self.actionReplay.triggered.connect(self.openReplay)
+        self.actionReplay.setObjectName("actionReplay")
+        self.actionReplay.setText("What-if Replay...")
+        self.menuAnalysis.addAction(self.actionReplay)
+        self.menubar.addAction(self.menuAnalysis.menuAction())
+
+        # Shows the acquisition jitter and graph update time in the status bar every timer tick
+        self.timerWidget.timerSignal.connect(self.showTimingStats)
+
+    def showTimingStats(self):
+        jitter = self.dataWidget.handleData.acquisitionJitter.summary()
+        frame = self.dataWidget.frameTimes.summary()
+        timer = self.timerWidget.tickJitter.summary()
+        source = "shared memory" if self.useSharedMemory else "in-process"
+        self.statusbar.showMessage(f"Acquisition ({source}) jitter: {jitter['mean']:.1f} ms avg, "
+                                   f"{jitter['max']:.1f} ms max | Graph update: {frame['mean']:.1f} ms avg, "
+                                   f"{frame['max']:.1f} ms max | Timer: {timer['mean']:.1f} ms late avg, "
+                                   f"{timer['max']:.1f} ms max, {self.timerWidget.missedSlots} missed")
+
+    def openReplay(self):
+        self.replayDialog = ReplayDialog(self, self.dataWidget)
+        self.replayDialog.show()
+
+    def closeEvent(self, event):
+        # Makes sure the acquisition process, shared memory and sensor log threads are cleaned up
+        self.dataWidget.handleData.stopAcquisitionProcess()
+        self.dataWidget.handleData.stopSensorIngest()
+        self.dataWidget.handleData.retention.close()
+        super().closeEvent(event)
+
 
 if __name__ == '__main__':
     # Main loop to create the UI window and run it for the user to see, ends when they close the window
+    # Passing --shared-memory runs data acquisition in a separate process
+    # Passing --opengl draws the overlay graph with OpenGL when the machine supports it
     app = QApplication(sys.argv)
-    mainWindow = MainWindow()
+
+    # Passing --benchmark-overlay prints the overlay graph frame times instead of opening the UI
+    if "--benchmark-overlay" in sys.argv:
+        for (channelCount, batched), result in benchmarkOverlay(useOpenGL="--opengl" in sys.argv).items():
+            print(f"{channelCount} channels, {'batched' if batched else 'per-channel'}: {result['mean']:.2f} ms avg, "
+                  f"{result['max']:.2f} ms max ({'OpenGL' if result['openGL'] else 'software'})")
+        sys.exit(0)
+
+    # Passing --benchmark-startup prints the window build time and allocations per graph update
+    if "--benchmark-startup" in sys.argv:
+        result = benchmarkStartup()
+        print(f"Startup: {result['startup']['mean']:.1f} ms avg | Per tick: {result['blocksPerTick']:.0f} blocks, "
+              f"{result['bytesPerTick'] / 1024:.1f} KB")
+        sys.exit(0)
+
+    # Passing --benchmark-replay prints how fast a recorded run is replayed over a grid of targets and margins
+    if "--benchmark-replay" in sys.argv:
+        result = benchmarkReplay()
+        print(f"{result['samples']} samples x {result['combinations']} target/margin pairs in {result['seconds']:.2f} s "
+              f"({result['samplesPerSecond'] / 1e6:.1f} million sample evaluations per second)")
+        sys.exit(0)
+
+    # Passing --soak-test feeds weeks of simulated high rate data through the history and graphs, printing memory use
+    if "--soak-test" in sys.argv:
+        for day, rss in soakTest():
+            print(f"Day {day:5.1f}: {rss / 1024 / 1024:.1f} MB resident")
+        sys.exit(0)
+
+    # Passing --memory-cap MB sets how much memory the run history may use before it is spilled to disk
+    memoryCap = DEFAULT_MEMORY_CAP
+    if "--memory-cap" in sys.argv[:-1]:
+        memoryCap = float(sys.argv[sys.argv.index("--memory-cap") + 1])
+
+    mainWindow = MainWindow(useSharedMemory="--shared-memory" in sys.argv, useOpenGL="--opengl" in sys.argv,
+                            memoryCap=memoryCap)
+
+    # Passing --tail FILE (can be repeated) follows an instrument's CSV log as extra channels
+    for i, argument in enumerate(sys.argv[:-1]):
+        if argument == "--tail":
+            mainWindow.dataWidget.handleData.addSensorFile(sys.argv[i + 1])
     mainWindow.show()
     sys.exit(app.exec_())